@@ -1,12 +1,19 @@
 from flask import Flask
 from flask_cors import CORS
+from app.core import services
 from app.core.config import Config
 from app.api.routes import api
 from app.api.whatsapp import whatsapp
 from app.core.logger import app_logger
 
-def create_app():
-    """Crea y configura la aplicación Flask."""
+def create_app(warm_up=None):
+    """
+    Crea y configura la aplicación Flask.
+    
+    Args:
+        warm_up (bool, opcional): Calentar los servicios en segundo plano al crear la app.
+                                  Si es None se usa Config.WARM_UP_ON_STARTUP
+    """
     app = Flask(__name__)
     
     # Configurar la aplicación
@@ -19,6 +26,12 @@ def create_app():
     app.register_blueprint(api, url_prefix='/api')
     app.register_blueprint(whatsapp, url_prefix='/whatsapp')
     
+    # Los servicios se construyen bajo demanda; opcionalmente se calientan al arrancar
+    if warm_up is None:
+        warm_up = Config.WARM_UP_ON_STARTUP
+    if warm_up:
+        services.warm_up_in_background()
+    
     app_logger.info("Application initialized successfully")
     
     return app 
\ No newline at end of file
@@ -1,17 +1,24 @@
 from flask import Blueprint, request, jsonify
-from app.services.chat_service import ChatService
-from app.services.car_recommendation import CarRecommendationService
-from app.services.financing_service import FinancingService
+from app.core import services
 from app.core.logger import api_logger, error_logger
 
-# Inicializar servicios
-chat_service = ChatService()
-car_service = CarRecommendationService()
-financing_service = FinancingService()
-
 # Crear Blueprint
 api = Blueprint('api', __name__)
 
+@api.route('/health', methods=['GET'])
+def health():
+    """Endpoint de liveness: el proceso está en pie."""
+    return jsonify({'status': 'ok'})
+
+@api.route('/ready', methods=['GET'])
+def ready():
+    """Endpoint de readiness: indica si el catálogo está cargado."""
+    status = services.readiness()
+    if not status['ready']:
+        # Sin calentamiento al arrancar, la primera consulta de readiness lo dispara
+        services.warm_up_in_background()
+    return jsonify(status), 200 if status['ready'] else 503
+
 @api.route('/chat', methods=['POST'])
 def chat():
     """Endpoint para el chat con el asistente virtual."""
@@ -22,7 +29,7 @@ def chat():
             return jsonify({'error': 'Se requiere un mensaje'}), 400
 
         api_logger.info(f"Processing chat request: {data['message'][:100]}...")
-        response = chat_service.get_response(data['message'], data.get('context'))
+        response = services.get_chat_service().get_response(data['message'], data.get('context'))
         api_logger.info("Chat response generated successfully")
         return jsonify({'response': response})
 
@@ -40,7 +47,7 @@ def get_recommendations():
             return jsonify({'error': 'Se requieren preferencias'}), 400
 
         api_logger.info(f"Processing car recommendations request: {data}")
-        recommendations = car_service.get_recommendations(data)
+        recommendations = services.get_car_service().get_recommendations(data)
         api_logger.info(f"Found {len(recommendations)} recommendations")
         return jsonify({'recommendations': recommendations})
 
@@ -53,7 +60,7 @@ def get_car_details(car_id):
     """Endpoint para obtener detalles de un auto específico."""
     try:
         api_logger.info(f"Fetching details for car ID: {car_id}")
-        car_details = car_service.get_car_details(car_id)
+        car_details = services.get_car_service().get_car_details(car_id)
         if not car_details:
             api_logger.warning(f"Car not found with ID: {car_id}")
             return jsonify({'error': 'Auto no encontrado'}), 404
@@ -77,7 +84,7 @@ def calculate_financing():
             return jsonify({'error': 'Faltan campos requeridos'}), 400
 
         api_logger.info(f"Calculating financing for: {data}")
-        financing = financing_service.calculate_amortization_schedule(
+        financing = services.get_financing_service().calculate_amortization_schedule(
             data['car_price'],
             data['down_payment'],
             data['term_months']
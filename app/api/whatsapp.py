@@ -1,30 +1,21 @@
 from flask import Blueprint, request, jsonify
-from twilio.rest import Client
+from app.core import services
 from app.core.config import Config
-from app.services.chat_service import ChatService
-from app.services.car_recommendation import CarRecommendationService
-from app.services.financing_service import FinancingService
 from app.core.logger import whatsapp_logger, error_logger
-
-# Inicializar servicios
-chat_service = ChatService()
-car_service = CarRecommendationService()
-financing_service = FinancingService()
-
-# Inicializar cliente de Twilio
-twilio_client = Client(Config.TWILIO_ACCOUNT_SID, Config.TWILIO_AUTH_TOKEN)
+from app.services.conversation_store import ConversationStore
+from app.services.message_batcher import MessageBatcher
 
 # Crear Blueprint
 whatsapp = Blueprint('whatsapp', __name__)
 
-# Diccionario para almacenar el contexto de conversación por número
-conversation_contexts = {}
+# Contexto de conversación por número (últimos 10 mensajes)
+conversation_contexts = ConversationStore(max_messages=10)
 
 def send_whatsapp_message(to_number, message):
     """Envía un mensaje de WhatsApp usando Twilio."""
     try:
         whatsapp_logger.info(f"Sending WhatsApp message to {to_number}")
-        message = twilio_client.messages.create(
+        message = services.get_twilio_client().messages.create(
             from_=f'whatsapp:{Config.TWILIO_PHONE_NUMBER}',
             body=message,
             to=to_number
@@ -35,6 +26,28 @@ def send_whatsapp_message(to_number, message):
         error_logger.error(f"Error sending WhatsApp message: {str(e)}", exc_info=True)
         return None
 
+def generate_reply(from_number, message_body):
+    """Genera la respuesta del asistente para los mensajes acumulados de un número."""
+    conversation_history = conversation_contexts.get_history(from_number)
+    response = services.get_chat_service().get_response(message_body, conversation_history)
+    whatsapp_logger.info("Generated response for WhatsApp message")
+    return response
+
+def deliver_reply(from_number, message_body, response):
+    """Actualiza el contexto de la conversación y envía la respuesta."""
+    conversation_contexts.append_turn(from_number, message_body, response)
+    
+    # Enviar respuesta
+    send_whatsapp_message(from_number, response)
+
+# Agrupa ráfagas de mensajes por número en una sola respuesta
+message_batcher = MessageBatcher(
+    generate_reply,
+    deliver_reply,
+    window_seconds=Config.WHATSAPP_DEBOUNCE_SECONDS,
+    max_wait_seconds=Config.WHATSAPP_DEBOUNCE_MAX_WAIT_SECONDS
+)
+
 @whatsapp.route('/webhook', methods=['POST'])
 def webhook():
     """Webhook para recibir mensajes de WhatsApp."""
@@ -45,36 +58,8 @@ def webhook():
         
         whatsapp_logger.info(f"Received WhatsApp message from {from_number}: {message_body[:100]}...")
         
-        # Obtener el contexto de la conversación para este número
-        conversation_history = conversation_contexts.get(from_number, [])
-        
-        # Procesar el mensaje con el asistente virtual
-        response = chat_service.get_response(message_body, conversation_history)
-        whatsapp_logger.info("Generated response for WhatsApp message")
-        
-        # Actualizar el contexto de la conversación
-        if response:
-            # Agregar el mensaje del usuario al historial
-            conversation_history.append({
-                "role": "user",
-                "content": message_body
-            })
-            
-            # Agregar la respuesta del asistente al historial
-            conversation_history.append({
-                "role": "assistant",
-                "content": response
-            })
-            
-            # Mantener solo los últimos 10 mensajes
-            if len(conversation_history) > 10:
-                conversation_history = conversation_history[-10:]
-            
-            # Actualizar el contexto
-            conversation_contexts[from_number] = conversation_history
-            
-            # Enviar respuesta
-            send_whatsapp_message(from_number, response)
+        # Encolar el mensaje; la respuesta se envía cuando termina la ráfaga
+        message_batcher.add(from_number, message_body)
         
         return jsonify({'status': 'success'})
 
@@ -9,15 +9,27 @@ class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     OPENAI_MODEL = "gpt-3.5-turbo"
     
+    # Registro de llamadas al LLM: off, record (graba en el log) o replay (responde desde el log)
+    LLM_CALL_LOG_MODE = os.getenv("LLM_CALL_LOG_MODE", "off").lower()
+    LLM_CALL_LOG_PATH = os.getenv("LLM_CALL_LOG_PATH", "logs/llm_calls.jsonl.gz")
+    
     # Configuración de Twilio
     TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
     TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
     TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER")
     
+    # Ventana para agrupar ráfagas de mensajes de WhatsApp (0 = procesar cada mensaje al llegar)
+    WHATSAPP_DEBOUNCE_SECONDS = float(os.getenv("WHATSAPP_DEBOUNCE_SECONDS", "2.0"))
+    WHATSAPP_DEBOUNCE_MAX_WAIT_SECONDS = float(os.getenv("WHATSAPP_DEBOUNCE_MAX_WAIT_SECONDS", "8.0"))
+    
     # Configuración de la aplicación
     DEBUG = os.getenv("FLASK_DEBUG", "False").lower() == "true"
     SECRET_KEY = os.getenv("FLASK_SECRET_KEY", "dev-secret-key")
     
+    # Construir servicios y cargar el catálogo al arrancar (en segundo plano)
+    # en lugar de esperar a la primera petición
+    WARM_UP_ON_STARTUP = os.getenv("WARM_UP_ON_STARTUP", "False").lower() == "true"
+    
     # Configuración de financiamiento
     INTEREST_RATE = 0.10  # 10%
     MIN_TERM = 36  # 3 años en meses
@@ -0,0 +1,141 @@
+import threading
+import time
+from app.core.logger import app_logger, error_logger
+
+# Instancias compartidas, construidas bajo demanda la primera vez que se usan
+_instances = {}
+# Un lock por servicio: construir un servicio no bloquea la construcción de otros
+_instance_locks = {}
+_registry_lock = threading.Lock()
+_warmup_state = {'started_at': None, 'finished_at': None, 'error': None}
+_warmup_thread = None
+
+
+def _get_or_create(name, factory):
+    """
+    Devuelve la instancia registrada bajo `name`, creándola si no existe.
+
+    Args:
+        name (str): Nombre del servicio
+        factory (callable): Función que construye el servicio
+
+    Returns:
+        object: Instancia compartida del servicio
+    """
+    instance = _instances.get(name)
+    if instance is not None:
+        return instance
+
+    with _registry_lock:
+        lock = _instance_locks.setdefault(name, threading.Lock())
+
+    with lock:
+        instance = _instances.get(name)
+        if instance is None:
+            start = time.perf_counter()
+            instance = factory()
+            _instances[name] = instance
+            app_logger.info("Service '%s' initialized in %.3fs", name, time.perf_counter() - start)
+    return instance
+
+
+def get_car_service():
+    """Devuelve el servicio de recomendación de autos compartido."""
+    def factory():
+        from app.services.car_recommendation import CarRecommendationService
+        return CarRecommendationService()
+    return _get_or_create('car_service', factory)
+
+
+def get_financing_service():
+    """Devuelve el servicio de financiamiento compartido."""
+    def factory():
+        from app.services.financing_service import FinancingService
+        return FinancingService()
+    return _get_or_create('financing_service', factory)
+
+
+def get_chat_service():
+    """Devuelve el servicio de chat compartido."""
+    # Las dependencias se resuelven antes de tomar el lock del servicio de chat
+    car_service = get_car_service()
+
+    def factory():
+        from app.services.chat_service import ChatService
+        return ChatService(car_service=car_service)
+    return _get_or_create('chat_service', factory)
+
+
+def get_twilio_client():
+    """Devuelve el cliente de Twilio compartido."""
+    def factory():
+        from twilio.rest import Client
+        from app.core.config import Config
+        return Client(Config.TWILIO_ACCOUNT_SID, Config.TWILIO_AUTH_TOKEN)
+    return _get_or_create('twilio_client', factory)
+
+
+def warm_up():
+    """
+    Construye los servicios y carga el catálogo por adelantado.
+
+    Returns:
+        bool: True si el catálogo quedó cargado
+    """
+    _warmup_state['started_at'] = time.time()
+    _warmup_state['error'] = None
+    try:
+        app_logger.info("Warming up services")
+        car_service = get_car_service()
+        car_service.ensure_catalog_loaded()
+        get_financing_service()
+        get_chat_service()
+        app_logger.info("Services warmed up successfully")
+        return car_service.is_catalog_loaded()
+    except Exception as e:
+        _warmup_state['error'] = str(e)
+        error_logger.error("Error warming up services: %s", str(e), exc_info=True)
+        return False
+    finally:
+        _warmup_state['finished_at'] = time.time()
+
+
+def warm_up_in_background():
+    """
+    Lanza el calentamiento de servicios en un hilo en segundo plano.
+
+    Si ya hay un calentamiento en curso no se lanza otro.
+
+    Returns:
+        threading.Thread: Hilo que realiza el calentamiento
+    """
+    global _warmup_thread
+    with _registry_lock:
+        if _warmup_thread is None or not _warmup_thread.is_alive():
+            _warmup_thread = threading.Thread(target=warm_up, name='services-warmup', daemon=True)
+            _warmup_thread.start()
+        return _warmup_thread
+
+
+def readiness():
+    """
+    Reporta el estado de los servicios y del catálogo.
+
+    Returns:
+        dict: Estado de preparación de la aplicación
+    """
+    car_service = _instances.get('car_service')
+    catalog_loaded = bool(car_service and car_service.is_catalog_loaded())
+    return {
+        'ready': catalog_loaded,
+        'catalog_loaded': catalog_loaded,
+        'catalog_size': car_service.catalog_size() if catalog_loaded else 0,
+        'services': sorted(_instances.keys()),
+        'warmup': dict(_warmup_state),
+    }
+
+
+def reset():
+    """Elimina las instancias registradas (útil para pruebas)."""
+    with _registry_lock:
+        _instances.clear()
@@ -1,16 +1,41 @@
-import pandas as pd
 import os
+import threading
 from app.core.config import Config
 from app.core.logger import app_logger, error_logger
 
 class CarRecommendationService:
     def __init__(self):
-        self.catalog = None
+        self._catalog = None
+        self._catalog_lock = threading.Lock()
         app_logger.info("Initializing CarRecommendationService")
-        self.load_catalog()
+
+    @property
+    def catalog(self):
+        """Catálogo de autos, cargado la primera vez que se accede."""
+        if self._catalog is None:
+            self.ensure_catalog_loaded()
+        return self._catalog
+
+    def ensure_catalog_loaded(self):
+        """Carga el catálogo si todavía no se ha cargado."""
+        if self._catalog is None:
+            with self._catalog_lock:
+                if self._catalog is None:
+                    self.load_catalog()
+
+    def is_catalog_loaded(self):
+        """Indica si el catálogo está cargado y contiene autos."""
+        return self._catalog is not None and not self._catalog.empty
+
+    def catalog_size(self):
+        """Devuelve el número de autos en el catálogo cargado."""
+        return 0 if self._catalog is None else len(self._catalog)
 
     def load_catalog(self):
         """Carga el catálogo de autos desde el archivo CSV."""
+        # pandas se importa aquí para no penalizar el arranque de la aplicación
+        import pandas as pd
+
         try:
             # Obtener la ruta absoluta del archivo
             base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,31 +48,33 @@ class CarRecommendationService:
                 raise FileNotFoundError(f"Catalog file not found at: {catalog_path}")
             
             # Cargar el catálogo y convertir tipos de datos
-            self.catalog = pd.read_csv(catalog_path)
+            catalog = pd.read_csv(catalog_path)
             
             # Convertir columnas numéricas
             numeric_columns = ['price', 'km', 'year']
             for col in numeric_columns:
-                if col in self.catalog.columns:
-                    self.catalog[col] = pd.to_numeric(self.catalog[col], errors='coerce')
+                if col in catalog.columns:
+                    catalog[col] = pd.to_numeric(catalog[col], errors='coerce')
             
-            app_logger.info("Successfully loaded catalog with %d cars", len(self.catalog))
+            app_logger.info("Successfully loaded catalog with %d cars", len(catalog))
             
             # Verificar que el catálogo tenga datos
-            if self.catalog.empty:
+            if catalog.empty:
                 error_logger.error("Catalog file is empty")
                 raise ValueError("Catalog file is empty")
                 
             # Verificar columnas requeridas
             required_columns = ['make', 'model', 'year', 'price', 'km', 'version']
-            missing_columns = [col for col in required_columns if col not in self.catalog.columns]
+            missing_columns = [col for col in required_columns if col not in catalog.columns]
             if missing_columns:
                 error_logger.error("Missing required columns in catalog: %s", missing_columns)
                 raise ValueError(f"Missing required columns in catalog: {missing_columns}")
+
+            self._catalog = catalog
                 
         except Exception as e:
             error_logger.error("Error loading car catalog: %s", str(e), exc_info=True)
-            self.catalog = pd.DataFrame()
+            self._catalog = pd.DataFrame()
             app_logger.warning("Initialized empty catalog due to loading error")
 
     def get_recommendations(self, preferences):
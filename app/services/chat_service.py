@@ -1,13 +1,21 @@
-import openai
+import os
+import threading
 from app.core.config import Config
 from app.core.logger import app_logger, error_logger
 from app.services.car_recommendation import CarRecommendationService
+from app.services.llm_recorder import LLMCallRecorder, ReplayMissError
 
 class ChatService:
-    def __init__(self):
-        self.client = openai.OpenAI(api_key=Config.OPENAI_API_KEY)
+    def __init__(self, car_service=None):
+        self._client = None
+        self._client_lock = threading.Lock()
         self.model = Config.OPENAI_MODEL
-        self.car_service = CarRecommendationService()
+        self.car_service = car_service or CarRecommendationService()
+        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.recorder = LLMCallRecorder(
+            Config.LLM_CALL_LOG_MODE,
+            os.path.join(base_dir, Config.LLM_CALL_LOG_PATH)
+        )
         self.system_prompt = """Eres un asistente virtual de Kavak, especializado en la venta de autos seminuevos. Tu objetivo es ayudar a los clientes a encontrar el auto ideal y guiarlos en el proceso de compra.
 
         Tienes acceso a un catálogo de autos con la siguiente información:
@@ -40,6 +48,34 @@ class ChatService:
 
         app_logger.info("ChatService initialized with OpenAI model: %s", self.model)
 
+    @property
+    def client(self):
+        """Cliente de OpenAI, construido la primera vez que se usa."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    # openai se importa aquí para no penalizar el arranque de la aplicación
+                    import openai
+                    self._client = openai.OpenAI(api_key=Config.OPENAI_API_KEY)
+        return self._client
+
+    def _create_completion(self, stage, **request):
+        """
+        Llama a chat.completions.create pasando por el registro de llamadas.
+        
+        Args:
+            stage (str): Etapa del flujo que hace la llamada
+            **request: Parámetros de la llamada
+            
+        Returns:
+            object: Respuesta del modelo
+        """
+        return self.recorder.complete(
+            stage,
+            lambda **kwargs: self.client.chat.completions.create(**kwargs),
+            **request
+        )
+
     def _extract_preferences(self, message):
         """
         Extrae preferencias de búsqueda del mensaje del usuario.
@@ -51,7 +87,8 @@ class ChatService:
             dict: Preferencias extraídas
         """
         try:
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
+                'extract_preferences',
                 model=self.model,
                 messages=[
                     {"role": "system", "content": """Extrae preferencias de búsqueda de autos del mensaje. 
@@ -70,6 +107,9 @@ class ChatService:
             
             preferences = eval(response.choices[0].message.content)
             return preferences
+        except ReplayMissError:
+            # En replay una petición no grabada debe hacer fallar la corrida
+            raise
         except Exception as e:
             error_logger.error("Error extracting preferences: %s", str(e))
             return {}
@@ -143,7 +183,8 @@ class ChatService:
             
             # Crear la respuesta
             app_logger.debug("Sending request to OpenAI API")
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
+                'generate_response',
                 model=self.model,
                 messages=messages,
                 temperature=0.7,
@@ -156,6 +197,10 @@ class ChatService:
             app_logger.info("Successfully generated response from OpenAI")
             return bot_response
             
+        except ReplayMissError:
+            error_logger.error("LLM replay miss in ChatService", exc_info=True)
+            raise
+            
         except Exception as e:
             error_logger.error("Error in ChatService: %s", str(e), exc_info=True)
             return "Lo siento, ha ocurrido un error al procesar tu mensaje. Por favor, intenta de nuevo más tarde."
\ No newline at end of file
@@ -0,0 +1,51 @@
+import threading
+from app.core.logger import app_logger
+
+
+class ConversationStore:
+    """
+    Historial de conversación por número, seguro para usar desde varios hilos o greenlets.
+
+    El historial vive en la memoria del proceso: cada worker de gunicorn tiene el suyo.
+    """
+
+    def __init__(self, max_messages=10):
+        self.max_messages = max_messages
+        self._histories = {}
+        self._lock = threading.Lock()
+
+    def get_history(self, key):
+        """
+        Devuelve una copia del historial de un número.
+
+        Args:
+            key (str): Número de WhatsApp
+
+        Returns:
+            list: Mensajes en formato {"role": ..., "content": ...}
+        """
+        with self._lock:
+            return list(self._histories.get(key, []))
+
+    def append_turn(self, key, user_message, assistant_message):
+        """
+        Agrega un intercambio usuario/asistente y recorta el historial.
+
+        Args:
+            key (str): Número de WhatsApp
+            user_message (str): Mensaje del usuario
+            assistant_message (str): Respuesta del asistente
+        """
+        with self._lock:
+            history = self._histories.get(key, [])
+            history = history + [
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": assistant_message}
+            ]
+            # Mantener solo los últimos mensajes
+            self._histories[key] = history[-self.max_messages:]
+            app_logger.debug("Stored conversation turn for %s (%d messages)", key, len(self._histories[key]))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._histories)
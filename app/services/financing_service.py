@@ -1,5 +1,4 @@
 from app.core.config import Config
-import numpy as np
 from datetime import datetime
 from app.core.logger import app_logger, error_logger
 
@@ -0,0 +1,232 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+from app.core.logger import app_logger, error_logger
+
+MODE_OFF = 'off'
+MODE_RECORD = 'record'
+MODE_REPLAY = 'replay'
+MODES = (MODE_OFF, MODE_RECORD, MODE_REPLAY)
+
+# Encabezado de cada miembro gzip (magic + método deflate)
+GZIP_MEMBER_HEADER = b'\x1f\x8b\x08'
+
+# Tamaño de los fragmentos que se entregan al descompresor al leer el log
+READ_CHUNK_SIZE = 8 * 1024
+
+
+class ReplayMissError(LookupError):
+    """La petición no está en el log de llamadas en modo replay."""
+
+
+def request_hash(request):
+    """
+    Calcula un hash estable de los parámetros de una llamada al LLM.
+
+    Args:
+        request (dict): Parámetros enviados a chat.completions.create
+
+    Returns:
+        str: Hash SHA-256 en hexadecimal
+    """
+    payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _iter_gzip_members(data):
+    """
+    Descomprime los miembros gzip de un log, uno por uno.
+
+    Un miembro truncado o corrupto (por ejemplo, un proceso que murió a mitad de
+    una escritura) se salta y la lectura continúa en el siguiente encabezado gzip.
+
+    Args:
+        data (bytes): Contenido completo del log
+
+    Yields:
+        bytes: Contenido descomprimido de cada miembro válido
+    """
+    # Cada miembro se alimenta en fragmentos acotados: así unused_data nunca copia más
+    # de un fragmento y la lectura es lineal en el tamaño del log
+    view = memoryview(data)
+    size = len(data)
+    offset = 0
+    while offset < size:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        position = offset
+        pieces = []
+        try:
+            while not decompressor.eof and position < size:
+                end = min(position + READ_CHUNK_SIZE, size)
+                pieces.append(decompressor.decompress(view[position:end]))
+                position = end
+            complete = decompressor.eof
+        except zlib.error:
+            complete = False
+
+        if not complete:
+            next_offset = data.find(GZIP_MEMBER_HEADER, offset + 1)
+            app_logger.warning("Skipping truncated or corrupt LLM call log record at byte %d", offset)
+            if next_offset == -1:
+                return
+            offset = next_offset
+            continue
+
+        yield b''.join(pieces)
+        offset = position - len(decompressor.unused_data)
+
+
+def read_call_log(path):
+    """
+    Lee todas las llamadas registradas en el log.
+
+    Los registros incompletos se descartan y se conservan los demás.
+
+    Args:
+        path (str): Ruta al log comprimido
+
+    Returns:
+        list: Registros en el orden en que se escribieron
+    """
+    if not os.path.exists(path):
+        return []
+
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    records = []
+    for chunk in _iter_gzip_members(data):
+        for line in chunk.decode('utf-8', errors='replace').splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                app_logger.warning("Skipping malformed LLM call log record")
+    return records
+
+
+def _to_namespace(value):
+    """Convierte dicts anidados en objetos con acceso por atributo."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _to_namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(item) for item in value]
+    return value
+
+
+def _to_dict(response):
+    """Serializa una respuesta de OpenAI a un dict."""
+    if hasattr(response, 'model_dump'):
+        return response.model_dump()
+    if isinstance(response, SimpleNamespace):
+        return {key: _to_dict(item) for key, item in vars(response).items()}
+    if isinstance(response, list):
+        return [_to_dict(item) for item in response]
+    return response
+
+
+class LLMCallRecorder:
+    """
+    Registra y reproduce llamadas a chat.completions.create.
+
+    Modos:
+        off: las llamadas van directo a la API
+        record: las llamadas van a la API y se agregan al log con latencia y tokens
+        replay: las respuestas se sirven desde el log por hash de la petición, sin red
+    """
+
+    def __init__(self, mode=MODE_OFF, log_path=None):
+        if mode not in MODES:
+            raise ValueError(f"Invalid LLM call log mode: {mode}. Expected one of {MODES}")
+        self.mode = mode
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._replay_index = None
+        self._replay_positions = {}
+        app_logger.info("LLMCallRecorder initialized in '%s' mode (log: %s)", mode, log_path)
+
+    def complete(self, stage, create_fn, **request):
+        """
+        Ejecuta (o reproduce) una llamada al LLM.
+
+        Args:
+            stage (str): Etapa del flujo que hace la llamada (por ejemplo 'extract_preferences')
+            create_fn (callable): Función que hace la llamada real con los parámetros dados
+            **request: Parámetros de la llamada
+
+        Returns:
+            object: Respuesta del LLM
+        """
+        if self.mode == MODE_REPLAY:
+            return self._replay(stage, request)
+
+        start = time.perf_counter()
+        response = create_fn(**request)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        if self.mode == MODE_RECORD:
+            try:
+                self._append(stage, request, response, latency_ms)
+            except Exception as e:
+                error_logger.error("Error recording LLM call: %s", str(e), exc_info=True)
+        return response
+
+    def _append(self, stage, request, response, latency_ms):
+        """Agrega un registro al log como un miembro gzip independiente."""
+        response_data = _to_dict(response)
+        record = {
+            'hash': request_hash(request),
+            'timestamp': time.time(),
+            'stage': stage,
+            'latency_ms': round(latency_ms, 2),
+            'usage': response_data.get('usage') if isinstance(response_data, dict) else None,
+            'request': request,
+            'response': response_data,
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        data = gzip.compress(line.encode('utf-8'))
+
+        log_dir = os.path.dirname(self.log_path)
+        if log_dir and not os.path.exists(log_dir):
+            os.makedirs(log_dir, exist_ok=True)
+
+        # Una sola escritura en modo append para no intercalar registros entre procesos
+        with self._lock:
+            fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    def _load_replay_index(self):
+        """Carga el log en memoria agrupando las respuestas por hash."""
+        index = {}
+        for record in read_call_log(self.log_path):
+            index.setdefault(record['hash'], []).append(record['response'])
+        app_logger.info("Loaded %d recorded LLM requests for replay", len(index))
+        return index
+
+    def _replay(self, stage, request):
+        """Devuelve la respuesta registrada para la petición."""
+        key = request_hash(request)
+        with self._lock:
+            if self._replay_index is None:
+                self._replay_index = self._load_replay_index()
+
+            responses = self._replay_index.get(key)
+            if not responses:
+                raise ReplayMissError(f"No recorded LLM response for stage '{stage}' (request {key[:12]})")
+
+            # Las respuestas repetidas se sirven en el orden en que se grabaron
+            position = self._replay_positions.get(key, 0)
+            self._replay_positions[key] = position + 1
+            response = responses[min(position, len(responses) - 1)]
+
+        return _to_namespace(response)
@@ -0,0 +1,197 @@
+import itertools
+import threading
+import time
+from app.core.logger import app_logger, error_logger
+
+# Intervalo para revisar respuestas en curso al vaciar los lotes durante el apagado
+DRAIN_POLL_SECONDS = 0.05
+
+
+class _PendingBatch:
+    """Estado de los mensajes pendientes de un remitente."""
+
+    def __init__(self):
+        self.messages = []
+        self.first_message_at = None
+        self.timer = None
+        self.token = None
+        self.in_flight = False
+
+
+class MessageBatcher:
+    """
+    Agrupa ráfagas de mensajes de un mismo remitente en una sola llamada.
+
+    Cada mensaje nuevo reinicia una ventana de espera (debounce). Cuando la ventana
+    vence sin mensajes nuevos, los mensajes acumulados se concatenan y se procesan
+    juntos. Si llegan mensajes mientras se genera la respuesta, esa respuesta se
+    descarta y los mensajes se reprocesan junto con los nuevos, salvo que ya se haya
+    superado la espera máxima: en ese caso se entrega la respuesta y los mensajes
+    nuevos se responden en el siguiente turno.
+
+    Mientras hay una respuesta en curso no se programan temporizadores: al terminar,
+    el mismo procesamiento reprograma los mensajes que hayan llegado.
+    """
+
+    def __init__(self, process_fn, deliver_fn, window_seconds=2.0, max_wait_seconds=8.0):
+        """
+        Args:
+            process_fn (callable): Recibe (key, text) y devuelve la respuesta generada
+            deliver_fn (callable): Recibe (key, text, response) y entrega la respuesta
+            window_seconds (float): Silencio requerido antes de procesar. Con 0 se procesa de inmediato
+            max_wait_seconds (float): Espera máxima desde el primer mensaje pendiente
+        """
+        self.process_fn = process_fn
+        self.deliver_fn = deliver_fn
+        self.window_seconds = window_seconds
+        self.max_wait_seconds = max(max_wait_seconds, window_seconds)
+        self._batches = {}
+        self._lock = threading.Lock()
+        # Identificador único por temporizador programado, para ignorar los obsoletos
+        self._tokens = itertools.count(1)
+
+    def add(self, key, message):
+        """
+        Agrega un mensaje al lote pendiente del remitente.
+
+        Args:
+            key (str): Identificador del remitente (número de WhatsApp)
+            message (str): Texto del mensaje
+        """
+        with self._lock:
+            batch = self._batches.setdefault(key, _PendingBatch())
+            if batch.first_message_at is None:
+                batch.first_message_at = time.monotonic()
+            batch.messages.append(message)
+            app_logger.debug("Queued message for %s (%d pending)", key, len(batch.messages))
+
+            if batch.in_flight:
+                # El procesamiento en curso recoge este mensaje al terminar
+                return
+            if self.window_seconds > 0:
+                self._schedule(key, batch)
+                return
+
+        self._flush(key)
+
+    def pending_count(self, key):
+        """Devuelve el número de mensajes pendientes para un remitente."""
+        with self._lock:
+            batch = self._batches.get(key)
+            return len(batch.messages) if batch else 0
+
+    def pending_keys(self):
+        """Devuelve los remitentes con mensajes pendientes o una respuesta en curso."""
+        with self._lock:
+            return sorted(key for key, batch in self._batches.items() if batch.messages or batch.in_flight)
+
+    def is_idle(self):
+        """Indica si no hay mensajes pendientes ni respuestas en curso."""
+        return not self.pending_keys()
+
+    def flush_all(self, timeout=None):
+        """
+        Procesa de inmediato todos los lotes pendientes y espera las respuestas en curso.
+
+        Pensado para el apagado del proceso, cuando los temporizadores ya no van a vencer.
+
+        Args:
+            timeout (float, opcional): Segundos máximos de espera. None espera indefinidamente
+
+        Returns:
+            bool: True si no quedó trabajo pendiente
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                ready = [key for key, batch in self._batches.items() if batch.messages and not batch.in_flight]
+                busy = any(batch.in_flight for batch in self._batches.values())
+
+            if not ready and not busy:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                app_logger.warning("Timed out flushing message batches; %d sender(s) pending",
+                                   len(self.pending_keys()))
+                return False
+
+            for key in ready:
+                self._flush(key)
+            if not ready:
+                time.sleep(DRAIN_POLL_SECONDS)
+
+    def _schedule(self, key, batch):
+        """(Re)programa el procesamiento del lote. Debe llamarse con el lock tomado."""
+        if batch.timer is not None:
+            batch.timer.cancel()
+
+        elapsed = time.monotonic() - batch.first_message_at
+        delay = max(0.0, min(self.window_seconds, self.max_wait_seconds - elapsed))
+        batch.token = next(self._tokens)
+        batch.timer = threading.Timer(delay, self._flush, args=(key, batch.token))
+        batch.timer.daemon = True
+        batch.timer.start()
+
+    def _flush(self, key, token=None):
+        """
+        Procesa los mensajes acumulados de un remitente.
+
+        Args:
+            key (str): Identificador del remitente
+            token (int, opcional): Token del temporizador que dispara el procesamiento.
+                                   Si ya no es el vigente (fue reprogramado), no se hace nada
+        """
+        with self._lock:
+            batch = self._batches.get(key)
+            if batch is None or not batch.messages or batch.in_flight:
+                return
+            if token is not None and token != batch.token:
+                # cancel() no detiene un temporizador que ya venció y esperaba el lock
+                return
+
+            if batch.timer is not None:
+                batch.timer.cancel()
+            messages = batch.messages
+            started_at = batch.first_message_at
+            batch.messages = []
+            batch.first_message_at = None
+            batch.timer = None
+            batch.token = None
+            batch.in_flight = True
+
+        text = "\n".join(messages)
+        app_logger.info("Processing batch of %d message(s) for %s", len(messages), key)
+
+        try:
+            response = self.process_fn(key, text)
+
+            with self._lock:
+                waited = time.monotonic() - started_at
+                if batch.messages and waited < self.max_wait_seconds:
+                    # Llegaron mensajes durante la generación: se descarta la respuesta
+                    # y los mensajes procesados se reincorporan al lote pendiente,
+                    # conservando la hora del mensaje más antiguo para respetar la espera máxima
+                    app_logger.info("Discarding response for %s: %d new message(s) arrived",
+                                    key, len(batch.messages))
+                    batch.messages = messages + batch.messages
+                    batch.first_message_at = started_at
+                    return
+                if batch.messages:
+                    # Se agotó la espera máxima: se entrega la respuesta y los mensajes
+                    # nuevos quedan para el siguiente turno
+                    app_logger.info("Delivering response for %s after %.1fs; %d message(s) left for next turn",
+                                    key, waited, len(batch.messages))
+
+            if response:
+                self.deliver_fn(key, text, response)
+
+        except Exception as e:
+            error_logger.error("Error processing message batch for %s: %s", key, str(e), exc_info=True)
+
+        finally:
+            with self._lock:
+                batch.in_flight = False
+                if batch.messages:
+                    # Mensajes llegados durante la generación: se programan ahora
+                    self._schedule(key, batch)
+                else:
+                    self._batches.pop(key, None)
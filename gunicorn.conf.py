@@ -0,0 +1,75 @@
+"""
+Configuración de gunicorn.
+
+El servicio pasa casi todo su tiempo esperando a OpenAI y Twilio, por lo que el modelo
+por defecto es gthread (varios hilos por worker). También se soportan gevent y sync.
+Todos los valores se pueden cambiar con variables de entorno:
+
+    GUNICORN_WORKER_CLASS   gthread | gevent | sync (por defecto gthread)
+    GUNICORN_WORKERS        número de procesos (por defecto 2)
+    GUNICORN_THREADS        hilos por worker en gthread (por defecto 16)
+    GUNICORN_CONNECTIONS    conexiones concurrentes por worker en gevent (por defecto 200)
+    GUNICORN_TIMEOUT        segundos antes de reiniciar un worker bloqueado (por defecto 120)
+    GUNICORN_GRACEFUL_TIMEOUT segundos para terminar el trabajo pendiente al apagar (por defecto 30)
+    GUNICORN_BIND           dirección de escucha (por defecto 0.0.0.0:8000)
+    GUNICORN_PRELOAD        cargar la app y el catálogo en el proceso maestro (por defecto False)
+"""
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+WORKER_CLASSES = ('gthread', 'gevent', 'sync')
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread").lower()
+if worker_class not in WORKER_CLASSES:
+    raise ValueError(f"Invalid GUNICORN_WORKER_CLASS: {worker_class}. Expected one of {WORKER_CLASSES}")
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "16")) if worker_class == 'gthread' else 1
+worker_connections = int(os.getenv("GUNICORN_CONNECTIONS", "200"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+# Con preload el catálogo se carga una sola vez en el maestro y los workers lo
+# comparten en memoria (copy-on-write) en lugar de leer cada uno su copia
+preload_app = os.getenv("GUNICORN_PRELOAD", "False").lower() == "true"
+if preload_app and worker_class == 'gevent':
+    # Los locks creados al importar la app en el maestro no quedarían parcheados por gevent
+    raise ValueError("GUNICORN_PRELOAD is not supported with the gevent worker class")
+
+# La app se crea sin calentamiento: un hilo lanzado en el maestro (con preload) no
+# sobrevive al fork y podría dejar locks tomados. Cada worker se calienta en post_worker_init
+wsgi_app = "app:create_app(warm_up=False)"
+warm_up_on_startup = os.getenv("WARM_UP_ON_STARTUP", "False").lower() == "true"
+
+
+def when_ready(server):
+    """Carga el catálogo en el maestro antes de crear los workers (solo con preload)."""
+    if preload_app:
+        from app.core import services
+        services.get_car_service().ensure_catalog_loaded()
+        server.log.info("Catalog preloaded in master process")
+
+
+def post_worker_init(worker):
+    """Calienta los servicios del worker una vez inicializado (y parcheado por gevent)."""
+    worker.log.info("Worker %s started (%s, threads=%d)", worker.pid, worker_class, threads)
+    if warm_up_on_startup:
+        from app.core import services
+        services.warm_up_in_background()
+
+
+def worker_exit(server, worker):
+    """Responde los mensajes de WhatsApp pendientes antes de que el worker termine."""
+    whatsapp = sys.modules.get('app.api.whatsapp')
+    if whatsapp is None:
+        return
+    # Se deja margen antes de que el maestro mate al worker al vencer graceful_timeout
+    drained = whatsapp.message_batcher.flush_all(timeout=max(graceful_timeout - 5, 1))
+    if not drained:
+        worker.log.warning("Worker %s exited with pending WhatsApp messages: %s",
+                           worker.pid, ', '.join(whatsapp.message_batcher.pending_keys()))
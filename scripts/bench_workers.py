@@ -0,0 +1,211 @@
+"""
+Mide la capacidad de conversaciones concurrentes por núcleo para cada modelo de worker.
+
+Uso:
+    python scripts/bench_workers.py [--modes sync,gthread,gevent] [--levels 1,4,16,64,128]
+                                    [--duration 15] [--llm-latency-ms 800]
+
+Cada modo se levanta con gunicorn.conf.py y un solo worker (un núcleo). Las llamadas a
+OpenAI se sustituyen por una espera de --llm-latency-ms para reproducir un servicio que
+pasa casi todo su tiempo esperando I/O, sin red ni costo. Para cada nivel de concurrencia
+se simulan N conversaciones enviando turnos a /api/chat durante --duration segundos.
+
+La capacidad reportada es el mayor número de conversaciones concurrentes cuyo p95 de
+latencia por turno no supera --slo-factor veces la latencia ideal del turno.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cada turno hace dos llamadas al LLM: extracción de preferencias y respuesta
+LLM_CALLS_PER_TURN = 2
+
+
+def create_bench_app():
+    """Crea la aplicación con las llamadas a OpenAI sustituidas por una espera fija."""
+    from types import SimpleNamespace
+    from app import create_app
+    from app.services.chat_service import ChatService
+
+    latency = float(os.environ.get("BENCH_LLM_LATENCY_MS", "800")) / 1000
+
+    def simulated_completion(self, stage, **request):
+        time.sleep(latency)
+        content = "{'budget': 400000}" if stage == 'extract_preferences' else "Respuesta simulada"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    ChatService._create_completion = simulated_completion
+    # El calentamiento lo hace post_worker_init, como en producción
+    return create_app(warm_up=False)
+
+
+def free_port():
+    """Devuelve un puerto TCP libre en localhost."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, port, threads, llm_latency_ms):
+    """Levanta gunicorn con un solo worker en el modo indicado."""
+    env = dict(
+        os.environ,
+        GUNICORN_WORKER_CLASS=mode,
+        GUNICORN_WORKERS="1",
+        GUNICORN_THREADS=str(threads),
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        GUNICORN_PRELOAD="False",
+        WARM_UP_ON_STARTUP="True",
+        WHATSAPP_DEBOUNCE_SECONDS="0",
+        BENCH_LLM_LATENCY_MS=str(llm_latency_ms),
+    )
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+         '--pythonpath', 'scripts', 'bench_workers:create_bench_app()'],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/ready", timeout=1) as response:
+                if response.status == 200:
+                    return process
+        except Exception:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"gunicorn ({mode}) did not become ready")
+
+
+def run_level(port, conversations, duration, request_timeout):
+    """Simula conversaciones concurrentes y devuelve las latencias por turno."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.time() + duration
+
+    def conversation(index):
+        body = json.dumps({'message': f'Busco un SUV de máximo 400 mil (conversación {index})'}).encode('utf-8')
+        while time.time() < stop_at:
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{port}/api/chat",
+                data=body,
+                headers={'Content-Type': 'application/json'}
+            )
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=request_timeout) as response:
+                    response.read()
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+
+    workers = [threading.Thread(target=conversation, args=(i,), daemon=True) for i in range(conversations)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(duration + request_timeout + 5)
+    return sorted(latencies), errors[0]
+
+
+def percentile(ordered, fraction):
+    """Devuelve el percentil indicado de una lista ordenada."""
+    if not ordered:
+        return float('inf')
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def bench_mode(mode, args):
+    """Recorre los niveles de concurrencia para un modo y devuelve los resultados."""
+    ideal_turn = LLM_CALLS_PER_TURN * args.llm_latency_ms / 1000
+    slo = args.slo_factor * ideal_turn
+    port = free_port()
+    process = start_server(mode, port, args.threads, args.llm_latency_ms)
+    results = []
+    try:
+        for conversations in args.levels:
+            latencies, errors = run_level(port, conversations, args.duration, request_timeout=max(slo * 4, 10))
+            p50 = percentile(latencies, 0.5)
+            p95 = percentile(latencies, 0.95)
+            result = {
+                'mode': mode,
+                'conversations': conversations,
+                'turns_per_second': len(latencies) / args.duration,
+                'p50': p50,
+                'p95': p95,
+                'errors': errors,
+                'within_slo': errors == 0 and p95 <= slo,
+            }
+            results.append(result)
+            print(f"{mode:<8}{conversations:>8}{result['turns_per_second']:>12.2f}{p50:>10.2f}{p95:>10.2f}"
+                  f"{errors:>8}  {'ok' if result['within_slo'] else 'over SLO'}")
+            if not result['within_slo']:
+                break
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default='sync,gthread,gevent')
+    parser.add_argument('--levels', default='1,4,16,64,128')
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--threads', type=int, default=16, help='hilos por worker en gthread')
+    parser.add_argument('--llm-latency-ms', type=float, default=800)
+    parser.add_argument('--slo-factor', type=float, default=1.5)
+    parser.add_argument('--output', help='guardar los resultados en JSON')
+    args = parser.parse_args()
+    args.levels = [int(level) for level in args.levels.split(',')]
+
+    print(f"Simulated LLM latency: {args.llm_latency_ms:.0f} ms/call, "
+          f"SLO: p95 <= {args.slo_factor * LLM_CALLS_PER_TURN * args.llm_latency_ms / 1000:.2f}s per turn, 1 worker")
+    print(f"{'mode':<8}{'convs':>8}{'turns/s':>12}{'p50 s':>10}{'p95 s':>10}{'errors':>8}")
+
+    all_results = []
+    summary = []
+    for mode in args.modes.split(','):
+        if mode == 'gevent' and importlib.util.find_spec('gevent') is None:
+            print("gevent   skipped: gevent is not installed")
+            continue
+        try:
+            results = bench_mode(mode, args)
+        except RuntimeError as e:
+            print(f"{mode:<8} skipped: {e}")
+            continue
+        all_results.extend(results)
+        passing = [result for result in results if result['within_slo']]
+        best = passing[-1] if passing else None
+        summary.append((mode, best))
+
+    print("\nCapacity per core (1 worker):")
+    for mode, best in summary:
+        if best:
+            print(f"  {mode:<8} {best['conversations']:>5} concurrent conversations, "
+                  f"{best['turns_per_second']:.2f} turns/s")
+        else:
+            print(f"  {mode:<8} below 1 concurrent conversation within SLO")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(all_results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
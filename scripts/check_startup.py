@@ -0,0 +1,32 @@
+"""
+Verifica el presupuesto de tiempo de arranque de la aplicación.
+
+Uso:
+    python scripts/check_startup.py [--budget SEGUNDOS]
+
+Ejecuta tests/test_startup.py, que mide import + create_app en un intérprete nuevo
+y comprueba que no se carguen dependencias pesadas al arrancar.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget', type=float, default=1.5)
+    args = parser.parse_args()
+
+    env = dict(os.environ, STARTUP_BUDGET_SECONDS=str(args.budget))
+    return subprocess.call(
+        [sys.executable, '-m', 'pytest', '-q', 'tests/test_startup.py'],
+        cwd=PROJECT_ROOT,
+        env=env
+    )
+
+
+if __name__ == '__main__':
+    sys.exit(main())
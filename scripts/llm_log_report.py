@@ -0,0 +1,112 @@
+"""
+Genera un reporte a partir del log de llamadas al LLM.
+
+Uso:
+    python scripts/llm_log_report.py [--log RUTA] [--top N]
+
+Muestra la latencia por etapa, las llamadas más lentas, los prompts más grandes
+y las peticiones duplicadas más frecuentes (candidatas a caché).
+"""
+import argparse
+import os
+import sys
+from collections import Counter, defaultdict
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from app.core.config import Config
+from app.services.llm_recorder import read_call_log
+
+
+def percentile(values, fraction):
+    """Devuelve el percentil indicado de una lista de valores."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def prompt_size(record):
+    """Tamaño del prompt: tokens reportados por la API o, en su defecto, caracteres."""
+    usage = record.get('usage') or {}
+    if usage.get('prompt_tokens'):
+        return usage['prompt_tokens'], 'tokens'
+    messages = record.get('request', {}).get('messages', [])
+    return sum(len(str(message.get('content', ''))) for message in messages), 'chars'
+
+
+def print_stage_latency(records):
+    """Imprime la latencia agregada por etapa, de la más lenta a la más rápida."""
+    by_stage = defaultdict(list)
+    for record in records:
+        by_stage[record.get('stage') or 'unknown'].append(record.get('latency_ms', 0.0))
+
+    print("\n== Latencia por etapa (ms) ==")
+    print(f"{'stage':<24}{'calls':>8}{'avg':>10}{'p50':>10}{'p95':>10}{'max':>10}{'total':>12}")
+    stages = sorted(by_stage.items(), key=lambda item: sum(item[1]), reverse=True)
+    for stage, latencies in stages:
+        print(f"{stage:<24}{len(latencies):>8}{sum(latencies) / len(latencies):>10.1f}"
+              f"{percentile(latencies, 0.5):>10.1f}{percentile(latencies, 0.95):>10.1f}"
+              f"{max(latencies):>10.1f}{sum(latencies):>12.1f}")
+
+
+def print_slowest_calls(records, top):
+    """Imprime las llamadas individuales más lentas."""
+    print(f"\n== {top} llamadas más lentas ==")
+    for record in sorted(records, key=lambda r: r.get('latency_ms', 0.0), reverse=True)[:top]:
+        usage = record.get('usage') or {}
+        print(f"{record.get('latency_ms', 0.0):>10.1f} ms  {record.get('stage', 'unknown'):<22}"
+              f"tokens={usage.get('total_tokens', '?')}  hash={record['hash'][:12]}")
+
+
+def print_biggest_prompts(records, top):
+    """Imprime las llamadas con los prompts más grandes."""
+    print(f"\n== {top} prompts más grandes ==")
+    sized = [(prompt_size(record), record) for record in records]
+    for (size, unit), record in sorted(sized, key=lambda item: item[0][0], reverse=True)[:top]:
+        messages = record.get('request', {}).get('messages', [])
+        print(f"{size:>10} {unit:<7} {record.get('stage', 'unknown'):<22}"
+              f"messages={len(messages)}  hash={record['hash'][:12]}")
+
+
+def print_duplicates(records, top):
+    """Imprime las peticiones idénticas que más se repiten."""
+    counts = Counter(record['hash'] for record in records)
+    duplicates = [(key, count) for key, count in counts.most_common() if count > 1][:top]
+    stage_by_hash = {record['hash']: record.get('stage', 'unknown') for record in records}
+    latency_by_hash = defaultdict(float)
+    for record in records:
+        latency_by_hash[record['hash']] += record.get('latency_ms', 0.0)
+
+    print(f"\n== {top} peticiones duplicadas más frecuentes ==")
+    if not duplicates:
+        print("Sin peticiones duplicadas")
+    for key, count in duplicates:
+        print(f"{count:>6}x  {stage_by_hash[key]:<22}total={latency_by_hash[key]:.1f} ms  hash={key[:12]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    # Misma resolución que ChatService: rutas relativas a la raíz del proyecto
+    parser.add_argument('--log', default=os.path.join(PROJECT_ROOT, Config.LLM_CALL_LOG_PATH))
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    records = read_call_log(args.log)
+    if not records:
+        print(f"No se encontraron llamadas en {args.log}")
+        return 1
+
+    total_tokens = sum((record.get('usage') or {}).get('total_tokens') or 0 for record in records)
+    print(f"Llamadas: {len(records)}  Tokens totales: {total_tokens}  Log: {args.log}")
+    print_stage_latency(records)
+    print_slowest_calls(records, args.top)
+    print_biggest_prompts(records, args.top)
+    print_duplicates(records, args.top)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
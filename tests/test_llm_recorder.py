@@ -0,0 +1,82 @@
+import gzip
+import json
+import os
+import time
+import pytest
+from types import SimpleNamespace
+from app.services.chat_service import ChatService
+from app.services.llm_recorder import LLMCallRecorder, ReplayMissError, read_call_log
+
+
+def fake_completion(**request):
+    content = request['messages'][-1]['content']
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=f"respuesta: {content}"))],
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+    )
+
+
+def test_replay_serves_recorded_response(tmp_path):
+    log_path = str(tmp_path / "llm_calls.jsonl.gz")
+    request = {'model': 'gpt-3.5-turbo', 'messages': [{'role': 'user', 'content': 'hola'}]}
+
+    LLMCallRecorder('record', log_path).complete('generate_response', fake_completion, **request)
+    replayed = LLMCallRecorder('replay', log_path).complete('generate_response', None, **request)
+
+    assert replayed.choices[0].message.content == "respuesta: hola"
+
+
+def test_replay_miss_propagates_from_chat_service(tmp_path):
+    service = ChatService()
+    service.recorder = LLMCallRecorder('replay', str(tmp_path / "empty.jsonl.gz"))
+
+    with pytest.raises(ReplayMissError):
+        service.get_response("Busco un SUV")
+
+
+def test_read_call_log_survives_truncated_record(tmp_path):
+    log_path = str(tmp_path / "llm_calls.jsonl.gz")
+    recorder = LLMCallRecorder('record', log_path)
+    for content in ['hola', 'busco un suv']:
+        recorder.complete('generate_response', fake_completion,
+                          model='gpt-3.5-turbo', messages=[{'role': 'user', 'content': content}])
+
+    # Simula un proceso que murió a mitad de la escritura del último registro
+    with open(log_path, 'rb') as f:
+        data = f.read()
+    with open(log_path, 'wb') as f:
+        f.write(data[:-10])
+
+    records = read_call_log(log_path)
+    assert [r['request']['messages'][-1]['content'] for r in records] == ['hola']
+
+    # Los registros escritos después del corte se siguen leyendo
+    recorder.complete('generate_response', fake_completion,
+                      model='gpt-3.5-turbo', messages=[{'role': 'user', 'content': 'rojo'}])
+    records = read_call_log(log_path)
+    assert [r['request']['messages'][-1]['content'] for r in records] == ['hola', 'rojo']
+
+
+def test_read_call_log_is_linear_in_log_size(tmp_path):
+    # Un miembro gzip por registro, como los escribe LLMCallRecorder, con contenido
+    # poco compresible para que el log tenga un tamaño realista (~2 KB por registro)
+    log_path = str(tmp_path / "llm_calls.jsonl.gz")
+    records = 5000
+    with open(log_path, 'wb') as f:
+        for i in range(records):
+            record = {
+                'hash': f'{i:064x}',
+                'stage': 'generate_response',
+                'latency_ms': 800.0,
+                'request': {'messages': [{'role': 'user', 'content': os.urandom(900).hex()}]},
+                'response': {'choices': []},
+            }
+            f.write(gzip.compress((json.dumps(record) + '\n').encode('utf-8')))
+
+    start = time.perf_counter()
+    loaded = read_call_log(log_path)
+    elapsed = time.perf_counter() - start
+
+    assert len(loaded) == records
+    assert loaded[-1]['hash'] == f'{records - 1:064x}'
+    assert elapsed < 1.5, f"reading {records} records took {elapsed:.2f}s"
@@ -0,0 +1,181 @@
+import threading
+import time
+from app.services import message_batcher
+from app.services.message_batcher import MessageBatcher
+
+
+class Recorder:
+    """process_fn/deliver_fn de prueba que registran las llamadas."""
+
+    def __init__(self, generation_seconds=0.0):
+        self.generation_seconds = generation_seconds
+        self.processed = []
+        self.delivered = []
+        self.generating = threading.Event()
+        self.lock = threading.Lock()
+
+    def process(self, key, text):
+        with self.lock:
+            self.processed.append(text)
+        self.generating.set()
+        time.sleep(self.generation_seconds)
+        return f"reply:{text}"
+
+    def deliver(self, key, text, response):
+        with self.lock:
+            self.delivered.append(text)
+
+
+class FakeTimer:
+    """Temporizador controlado por la prueba: solo se dispara con fire()."""
+
+    created = []
+
+    def __init__(self, delay, function, args=()):
+        self.delay = delay
+        self.function = function
+        self.args = args
+        self.daemon = False
+        FakeTimer.created.append(self)
+
+    def start(self):
+        pass
+
+    def cancel(self):
+        # Simula un temporizador que ya venció y espera el lock: cancel() no lo detiene
+        pass
+
+    def fire(self):
+        self.function(*self.args)
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_burst_is_coalesced_into_one_call():
+    recorder = Recorder()
+    batcher = MessageBatcher(recorder.process, recorder.deliver, window_seconds=0.15, max_wait_seconds=2)
+
+    for message in ["hola", "busco un suv", "máximo 400 mil"]:
+        batcher.add("+5215555555555", message)
+        time.sleep(0.03)
+
+    assert wait_for(lambda: recorder.delivered)
+    time.sleep(0.2)
+    assert recorder.processed == ["hola\nbusco un suv\nmáximo 400 mil"]
+    assert recorder.delivered == ["hola\nbusco un suv\nmáximo 400 mil"]
+    assert batcher.pending_count("+5215555555555") == 0
+
+
+def test_message_arriving_in_flight_is_folded_in():
+    recorder = Recorder(generation_seconds=0.3)
+    batcher = MessageBatcher(recorder.process, recorder.deliver, window_seconds=0.05, max_wait_seconds=5)
+
+    batcher.add("a", "hola")
+    assert recorder.generating.wait(1)
+    batcher.add("a", "busco un suv")
+
+    assert wait_for(lambda: recorder.delivered)
+    assert recorder.processed == ["hola", "hola\nbusco un suv"]
+    assert recorder.delivered == ["hola\nbusco un suv"]
+
+
+def test_max_wait_delivers_in_flight_reply():
+    recorder = Recorder(generation_seconds=0.5)
+    batcher = MessageBatcher(recorder.process, recorder.deliver, window_seconds=0.2, max_wait_seconds=1)
+
+    start = time.monotonic()
+    for i in range(10):
+        batcher.add("a", str(i))
+        time.sleep(0.4)
+    first_reply_within_burst = bool(recorder.delivered)
+
+    assert wait_for(batcher.is_idle)
+    delivered = [message for text in recorder.delivered for message in text.split("\n")]
+
+    assert first_reply_within_burst, f"no reply after {time.monotonic() - start:.1f}s of steady typing"
+    assert sorted(delivered, key=int) == [str(i) for i in range(10)]
+    assert len(recorder.processed) <= len(recorder.delivered) + 2
+
+
+def test_zero_window_processes_each_message_immediately():
+    recorder = Recorder()
+    batcher = MessageBatcher(recorder.process, recorder.deliver, window_seconds=0)
+
+    batcher.add("a", "hola")
+    assert recorder.delivered == ["hola"]
+    batcher.add("a", "busco un suv")
+    assert recorder.delivered == ["hola", "busco un suv"]
+
+
+def test_stale_timer_does_not_flush_rescheduled_batch(monkeypatch):
+    FakeTimer.created = []
+    monkeypatch.setattr(message_batcher.threading, "Timer", FakeTimer)
+    recorder = Recorder()
+    batcher = MessageBatcher(recorder.process, recorder.deliver, window_seconds=1, max_wait_seconds=5)
+
+    batcher.add("a", "hola")
+    batcher.add("a", "busco un suv")
+    first, second = FakeTimer.created
+
+    # El primer temporizador fue reprogramado: no debe cortar la ventana del lote
+    first.fire()
+    assert recorder.processed == []
+    assert batcher.pending_count("a") == 2
+
+    second.fire()
+    assert recorder.processed == ["hola\nbusco un suv"]
+    assert batcher.is_idle()
+
+    # Temporizadores viejos tampoco procesan un lote nuevo del mismo número
+    batcher.add("a", "rojo")
+    first.fire()
+    second.fire()
+    assert recorder.processed == ["hola\nbusco un suv"]
+    assert batcher.pending_keys() == ["a"]
+
+    FakeTimer.created[-1].fire()
+    assert recorder.processed == ["hola\nbusco un suv", "rojo"]
+
+
+def test_no_timers_are_created_while_reply_is_in_flight(monkeypatch):
+    FakeTimer.created = []
+    monkeypatch.setattr(message_batcher.threading, "Timer", FakeTimer)
+    release = threading.Event()
+    recorder = Recorder()
+    recorder.process = lambda key, text: (recorder.processed.append(text), release.wait(2), "ok")[-1]
+    batcher = MessageBatcher(recorder.process, recorder.deliver, window_seconds=1, max_wait_seconds=5)
+
+    batcher.add("a", "hola")
+    flushing = threading.Thread(target=FakeTimer.created[0].fire)
+    flushing.start()
+    assert wait_for(lambda: recorder.processed)
+
+    for message in ["busco un suv", "rojo"]:
+        batcher.add("a", message)
+    assert len(FakeTimer.created) == 1
+
+    release.set()
+    flushing.join(2)
+    # Al terminar se programa un único temporizador para los mensajes acumulados
+    assert len(FakeTimer.created) == 2
+    FakeTimer.created[-1].fire()
+    assert recorder.processed[-1] == "hola\nbusco un suv\nrojo"
+
+
+def test_flush_all_processes_pending_batches_without_waiting_for_timers():
+    recorder = Recorder()
+    batcher = MessageBatcher(recorder.process, recorder.deliver, window_seconds=60, max_wait_seconds=60)
+
+    batcher.add("a", "hola")
+    batcher.add("b", "busco un suv")
+
+    assert batcher.flush_all(timeout=2)
+    assert sorted(recorder.delivered) == ["busco un suv", "hola"]
+    assert batcher.is_idle()
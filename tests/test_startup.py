@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Presupuesto de arranque (import + create_app), en segundos
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "1.5"))
+
+# Módulos que solo deben importarse al atender la primera petición
+HEAVY_MODULES = ['pandas', 'numpy', 'openai', 'twilio']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'loaded': [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_startup():
+    """Arranca la aplicación en un intérprete nuevo y devuelve la medición."""
+    env = dict(os.environ, WARM_UP_ON_STARTUP='False')
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_startup_within_budget():
+    # Mediana de varias corridas para no depender de un arranque en frío aislado
+    timings = sorted(measure_startup()['elapsed'] for _ in range(3))
+    assert timings[1] <= STARTUP_BUDGET_SECONDS, (
+        f"median startup {timings[1]:.3f}s exceeds budget {STARTUP_BUDGET_SECONDS:.3f}s"
+    )
+
+
+def test_startup_does_not_import_heavy_modules():
+    assert measure_startup()['loaded'] == []